@@ -4,15 +4,21 @@ MCP Router Final - Simple working version with proper resource management
 """
 
 import asyncio
+import bisect
 import json
 import logging
-from typing import Dict, Optional, Any
-from dataclasses import dataclass
+import math
+import random
+import re
+import sys
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
 
 import click
 import httpx
+import orjson
 import uvicorn
 from starlette.applications import Starlette
 from starlette.routing import Route
@@ -23,23 +29,180 @@ from starlette.responses import StreamingResponse, JSONResponse, Response
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Health check scheduling
+UNHEALTHY_THRESHOLD = 3         # consecutive failures before a backend is marked unhealthy
+HEALTH_CHECK_JITTER = 0.2       # +/- fraction applied to the healthy interval
+HEALTH_CHECK_EDGE_INTERVAL = 2  # seconds until re-probe after a failure or state flip
+HEALTH_CHECK_MAX_BACKOFF = 300  # cap in seconds for the unhealthy backoff
+HEALTH_PROBE_SCAN_LIMIT = 2048  # bytes of SSE output scanned by the GET fallback probe
 
-class ServerStatus(Enum):
-    """Status of a backend MCP server"""
-    HEALTHY = "healthy"
-    UNHEALTHY = "unhealthy"
-    CHECKING = "checking"
+# Circuit breaker around proxied requests
+CIRCUIT_FAILURE_THRESHOLD = 3   # consecutive proxy failures before the circuit opens
+CIRCUIT_OPEN_TIMEOUT = 30       # seconds an open circuit rejects traffic before a trial request
+CIRCUIT_SUCCESS_THRESHOLD = 2   # trial successes needed to close a half-open circuit
 
+# Backend selection
+MAX_BACKEND_WEIGHT = 1000       # upper bound so the round-robin schedule stays small
 
-@dataclass
+# Upstream timeouts: SSE streams are long-lived and only bound the connect,
+# message POSTs are bounded so a stalled backend surfaces as a failure
+SSE_TIMEOUT = httpx.Timeout(None, connect=5.0)
+MESSAGE_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Session id announced by the backend in the SSE `event: endpoint` data line
+SESSION_ID_PATTERN = re.compile(rb"session_id=([^&\s]+)[&\s]")
+SESSION_PRELUDE_LIMIT = 4096    # bytes of SSE output scanned for the endpoint event
+
+# Request headers that must not be forwarded to backends (ASGI header names are lowercase)
+_HOP_BY_HOP = frozenset({
+    b"host", b"connection", b"keep-alive", b"transfer-encoding", b"upgrade",
+    b"proxy-authorization", b"proxy-authenticate", b"te", b"trailers",
+})
+
+
+# Backend response headers recomputed by Starlette instead of being passed through
+_RESP_SKIP = frozenset({b"content-length", b"transfer-encoding"})
+
+
+def monotonic_isoformat(timestamp: float) -> str:
+    """Convert a time.monotonic() reading to a wall-clock ISO 8601 string"""
+    return datetime.fromtimestamp(time.time() - (time.monotonic() - timestamp)).isoformat()
+
+
+def forward_headers(request: Request) -> httpx.Headers:
+    """Build the headers to forward to a backend from the raw client headers"""
+    return httpx.Headers([(k, v) for k, v in request.headers.raw if k not in _HOP_BY_HOP])
+
+
+class ProxyStreamingResponse(StreamingResponse):
+    """Streaming response that runs a release callback once served, however it ends
+    
+    Starlette may cancel the body iterator before its first step (e.g. when the
+    client disconnects), so cleanup tied to the iterator itself is not reliable.
+    """
+    
+    def __init__(self, content: AsyncIterator[bytes], release, **kwargs):
+        super().__init__(content, **kwargs)
+        self.release = release
+        
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.release()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+# Status of a backend MCP server; interned so hot-path checks can use `is`
+HEALTHY = sys.intern("healthy")
+UNHEALTHY = sys.intern("unhealthy")
+CHECKING = sys.intern("checking")
+
+# Circuit breaker state of a backend MCP server
+CIRCUIT_CLOSED = sys.intern("closed")
+CIRCUIT_OPEN = sys.intern("open")
+CIRCUIT_HALF_OPEN = sys.intern("half_open")
+
+
+@dataclass(slots=True)
 class BackendServer:
     """Represents a backend MCP server"""
     name: str
     url: str
-    status: ServerStatus = ServerStatus.CHECKING
-    last_check: Optional[datetime] = None
-    last_healthy: Optional[datetime] = None
+    status: str = CHECKING
+    last_check: Optional[float] = None  # time.monotonic() of the last health check
+    last_healthy: Optional[float] = None  # time.monotonic() of the last successful check
+    last_check_iso: Optional[str] = None  # wall-clock ISO form, filled in lazily by get_status
+    last_healthy_iso: Optional[str] = None
     consecutive_failures: int = 0
+    next_check_at: float = 0.0  # time.monotonic() deadline for the next health check
+    state: str = CIRCUIT_CLOSED
+    next_attempt_time: float = 0.0  # time.monotonic() after which an open circuit admits a trial
+    half_open_inflight: int = 0
+    circuit_failures: int = 0
+    circuit_successes: int = 0
+    weight: int = 1
+    active_connections: int = 0
+    sse_url: str = field(init=False)
+    messages_url: str = field(init=False)
+    
+    def __post_init__(self):
+        # Build the proxied endpoint URLs once instead of per request
+        base_url = self.url.rstrip('/')
+        self.sse_url = f"{base_url}/sse"
+        self.messages_url = f"{base_url}/messages/"
+        
+    def allow_request(self) -> bool:
+        """Check whether the circuit admits a request, reserving a trial slot if half-open"""
+        if self.state is CIRCUIT_CLOSED:
+            return True
+            
+        now = time.monotonic()
+        if self.state is CIRCUIT_OPEN:
+            if now < self.next_attempt_time:
+                return False
+            self.state = CIRCUIT_HALF_OPEN
+            self.half_open_inflight = 0
+            self.circuit_successes = 0
+            logger.info(f"Backend {self.name} circuit half-open")
+            
+        # Half-open: admit one trial at a time; a trial that never reports back
+        # frees its slot once the timeout passes
+        if self.half_open_inflight and now < self.next_attempt_time:
+            return False
+        self.half_open_inflight = 1
+        self.next_attempt_time = now + CIRCUIT_OPEN_TIMEOUT
+        return True
+        
+    def on_success(self) -> None:
+        """Record a successful proxied request"""
+        self.circuit_failures = 0
+        if self.state is CIRCUIT_HALF_OPEN:
+            self.half_open_inflight = 0
+            self.circuit_successes += 1
+            if self.circuit_successes >= CIRCUIT_SUCCESS_THRESHOLD:
+                self.state = CIRCUIT_CLOSED
+                logger.info(f"Backend {self.name} circuit closed")
+                
+    def on_failure(self) -> None:
+        """Record a failed proxied request"""
+        self.circuit_failures += 1
+        if self.state is CIRCUIT_HALF_OPEN or self.circuit_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            if self.state is not CIRCUIT_OPEN:
+                logger.warning(f"Backend {self.name} circuit open")
+            self.state = CIRCUIT_OPEN
+            self.half_open_inflight = 0
+            self.next_attempt_time = time.monotonic() + CIRCUIT_OPEN_TIMEOUT
+
+
+def build_wrr_sequence(backends: List[BackendServer]) -> List[str]:
+    """Build one cycle of the interleaved weighted round-robin schedule (gcd algorithm)"""
+    if not backends:
+        return []
+        
+    weights = [backend.weight for backend in backends]
+    step = math.gcd(*weights)
+    max_weight = max(weights)
+    sequence = []
+    index = -1
+    current_weight = 0
+    for _ in range(sum(weights) // step):
+        while True:
+            index = (index + 1) % len(backends)
+            if index == 0:
+                current_weight -= step
+                if current_weight <= 0:
+                    current_weight = max_weight
+            if weights[index] >= current_weight:
+                sequence.append(backends[index].name)
+                break
+    return sequence
 
 
 class MCPRouter:
@@ -49,20 +212,76 @@ class MCPRouter:
         self.backends: Dict[str, BackendServer] = {}
         self.health_check_interval = health_check_interval
         self._health_check_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        # Weighted round-robin schedule used to break least-connections ties;
+        # rebuilt whenever the backend set changes
+        self._wrr_positions: Dict[str, List[int]] = {}
+        self._wrr_length = 0
+        self._wrr_cursor = 0
+        # MCP session_id -> name of the backend that owns the SSE session
+        self._session_backend: Dict[str, str] = {}
+        # Cached /status payload, rebuilt only after health or topology changes
+        self._status_snapshot: Dict[str, Any] = {}
+        self._status_dirty = True
         
-    async def add_backend(self, name: str, url: str) -> None:
+    async def add_backend(self, name: str, url: str, weight: int = 1) -> None:
         """Add a new backend server"""
-        self.backends[name] = BackendServer(name=name, url=url)
+        if not url.startswith(('http://', 'https://')):
+            raise ValueError(f"Backend URL must start with http:// or https://, got {url!r}")
+        if not isinstance(weight, int) or isinstance(weight, bool):
+            raise ValueError(f"Backend weight must be an integer, got {weight!r}")
+        if not 1 <= weight <= MAX_BACKEND_WEIGHT:
+            raise ValueError(f"Backend weight must be between 1 and {MAX_BACKEND_WEIGHT}, got {weight}")
+            
+        # Build the schedule before registering the backend so selection never
+        # sees a backend that is missing from it
+        backends = dict(self.backends)
+        backends[name] = BackendServer(name=name, url=url, weight=weight)
+        self._rebuild_schedule(backends)
+        self.backends[name] = backends[name]
+        self._status_dirty = True
         logger.info(f"Added backend server: {name} at {url}")
         
     async def remove_backend(self, name: str) -> None:
         """Remove a backend server"""
         if name in self.backends:
             del self.backends[name]
+            self._rebuild_schedule()
+            self._status_dirty = True
+            # Topology changed - drop sticky sessions owned by the removed backend
+            self._session_backend = {
+                session_id: owner for session_id, owner in self._session_backend.items()
+                if owner != name
+            }
             logger.info(f"Removed backend server: {name}")
             
+    def _rebuild_schedule(self, backends: Optional[Dict[str, BackendServer]] = None) -> None:
+        """Precompute the weighted round-robin schedule for a backend set (default: current)"""
+        if backends is None:
+            backends = self.backends
+        positions: Dict[str, List[int]] = {}
+        sequence = build_wrr_sequence(list(backends.values()))
+        for position, name in enumerate(sequence):
+            positions.setdefault(name, []).append(position)
+        self._wrr_positions = positions
+        self._wrr_length = len(sequence)
+        self._wrr_cursor = 0
+            
     async def start(self) -> None:
         """Start the router and health check loop"""
+        # Shared client so connections to each backend stay in the keepalive pool;
+        # HTTP/2 lets concurrent streams to a TLS backend share one connection
+        self._client = httpx.AsyncClient(
+            http2=True,
+            # No overall connection cap: over cleartext each SSE session holds its own
+            # connection, and a cap would starve message POSTs and health probes
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=64,
+                keepalive_expiry=60
+            ),
+            timeout=MESSAGE_TIMEOUT
+        )
         self._health_check_task = asyncio.create_task(self._health_check_loop())
         logger.info("MCP Router started")
         
@@ -74,72 +293,152 @@ class MCPRouter:
                 await self._health_check_task
             except asyncio.CancelledError:
                 pass
+        if self._client:
+            await self._client.aclose()
+            self._client = None
         logger.info("MCP Router stopped")
         
     async def _health_check_loop(self) -> None:
         """Continuously check health of backend servers"""
         while True:
-            await self._check_all_backends()
-            await asyncio.sleep(self.health_check_interval)
+            await self._check_due_backends()
+            
+            # Sleep until the nearest scheduled check, but wake at least once per
+            # interval so newly added backends are picked up
+            now = time.monotonic()
+            next_check_at = min(
+                (backend.next_check_at for backend in self.backends.values()),
+                default=now + self.health_check_interval
+            )
+            await asyncio.sleep(min(max(next_check_at - now, 0), self.health_check_interval))
             
-    async def _check_all_backends(self) -> None:
-        """Check health of all backend servers"""
-        tasks = [self._check_backend_health(backend) for backend in self.backends.values()]
+    async def _check_due_backends(self) -> None:
+        """Check health of backend servers whose next check is due"""
+        now = time.monotonic()
+        tasks = [
+            self._check_backend_health(backend, client=self._client)
+            for backend in self.backends.values()
+            if backend.next_check_at <= now
+        ]
         await asyncio.gather(*tasks, return_exceptions=True)
         
-    async def _check_backend_health(self, backend: BackendServer) -> None:
+    async def _check_backend_health(self, backend: BackendServer, client: httpx.AsyncClient) -> None:
         """Check health of a single backend server"""
-        backend.last_check = datetime.now()
+        backend.last_check = time.monotonic()
+        backend.last_check_iso = None
+        previous_status = backend.status
         
         try:
-            async with httpx.AsyncClient() as client:
+            # Liveness only - OPTIONS is answered (usually 405) without running the
+            # SSE handler; a HEAD would start an endless stream on a pooled connection
+            response = await client.options(backend.sse_url, timeout=5.0)
+            
+            if response.status_code == 501:
+                # OPTIONS not implemented - fall back to reading the start of the SSE
+                # stream, scanning raw bytes for the endpoint event
                 async with client.stream(
                     "GET",
-                    f"{backend.url}/sse",
-                    timeout=10.0,
+                    backend.sse_url,
+                    timeout=5.0,
                     headers={"Accept": "text/event-stream"}
                 ) as response:
-                    
                     if response.status_code != 200:
                         raise Exception(f"Non-200 status code: {response.status_code}")
-                    
-                    # Read just enough to see the endpoint event
-                    lines_read = 0
-                    async for line in response.aiter_lines():
-                        if line == "event: endpoint":
-                            backend.status = ServerStatus.HEALTHY
-                            backend.last_healthy = datetime.now()
-                            backend.consecutive_failures = 0
-                            logger.debug(f"Backend {backend.name} is healthy")
-                            return
-                        lines_read += 1
-                        if lines_read > 5:  # Don't read too many lines
+                        
+                    buffer = bytearray(b"\n")
+                    async for chunk in response.aiter_raw():
+                        buffer += chunk
+                        if b"\nevent: endpoint" in buffer:
                             break
-                    
-                    raise Exception("No endpoint event found")
+                        if len(buffer) > HEALTH_PROBE_SCAN_LIMIT:
+                            raise Exception("No endpoint event found")
+                    else:
+                        raise Exception("No endpoint event found")
+                        
+            elif not (response.is_success or response.status_code == 405):
+                raise Exception(f"Unexpected status code: {response.status_code}")
+            
+            backend.status = HEALTHY
+            backend.last_healthy = time.monotonic()
+            backend.last_healthy_iso = None
+            backend.consecutive_failures = 0
+            logger.debug(f"Backend {backend.name} is healthy")
                     
         except Exception as e:
             backend.consecutive_failures += 1
-            if backend.consecutive_failures >= 3:
-                backend.status = ServerStatus.UNHEALTHY
+            if backend.consecutive_failures >= UNHEALTHY_THRESHOLD:
+                backend.status = UNHEALTHY
                 logger.warning(f"Backend {backend.name} is unhealthy: {e}")
             else:
                 logger.debug(f"Backend {backend.name} health check failed (attempt {backend.consecutive_failures}): {e}")
                 
-    def get_healthy_backend(self, preferred: Optional[str] = None) -> Optional[BackendServer]:
-        """Get a healthy backend server"""
+        self._schedule_next_check(backend, previous_status)
+        self._status_dirty = True
+        
+    def _schedule_next_check(self, backend: BackendServer, previous_status: str) -> None:
+        """Schedule the next health check for a backend based on its state"""
+        if backend.status is not previous_status or (
+            0 < backend.consecutive_failures < UNHEALTHY_THRESHOLD
+        ):
+            # Re-probe quickly right after a state flip or while failures are accumulating
+            delay = HEALTH_CHECK_EDGE_INTERVAL
+        elif backend.status is UNHEALTHY:
+            # Back off exponentially while the backend stays down
+            exponent = min(backend.consecutive_failures - UNHEALTHY_THRESHOLD, 6)
+            delay = min(self.health_check_interval * 2 ** exponent, HEALTH_CHECK_MAX_BACKOFF)
+        else:
+            # Jitter healthy checks so probes don't synchronize across backends/routers
+            delay = self.health_check_interval * random.uniform(
+                1 - HEALTH_CHECK_JITTER, 1 + HEALTH_CHECK_JITTER
+            )
+        backend.next_check_at = time.monotonic() + delay
+                
+    def get_healthy_backend(
+        self, preferred: Optional[str] = None, key: Optional[str] = None
+    ) -> Optional[BackendServer]:
+        """Get a healthy backend server whose circuit admits the request
+        
+        If the preferred backend is unavailable and a key is given, the key is
+        hashed onto the healthy backends so the same key keeps landing on the
+        same backend while the topology is unchanged.
+        """
         if preferred and preferred in self.backends:
             backend = self.backends[preferred]
-            if backend.status == ServerStatus.HEALTHY:
+            if backend.status is HEALTHY and backend.allow_request():
                 return backend
                 
-        # Find any healthy backend
-        for backend in self.backends.values():
-            if backend.status == ServerStatus.HEALTHY:
+        if key is not None:
+            healthy = [
+                backend for backend in self.backends.values()
+                if backend.status is HEALTHY
+            ]
+            if healthy:
+                backend = healthy[hash(key) % len(healthy)]
+                if backend.allow_request():
+                    return backend
+                    
+        # Least connections (scaled by weight), ties broken by the weighted
+        # round-robin schedule; open circuits are skipped without probing them
+        candidates = [
+            backend for backend in self.backends.values()
+            if backend.status is HEALTHY
+        ]
+        candidates.sort(key=lambda b: (b.active_connections / b.weight, self._wrr_distance(b.name)))
+        for backend in candidates:
+            if backend.allow_request():
+                self._wrr_cursor = (self._wrr_cursor + self._wrr_distance(backend.name) + 1) % self._wrr_length
                 return backend
                 
         return None
         
+    def _wrr_distance(self, name: str) -> int:
+        """Number of schedule slots from the cursor to the backend's next turn"""
+        positions = self._wrr_positions[name]
+        index = bisect.bisect_left(positions, self._wrr_cursor)
+        if index == len(positions):
+            return positions[0] + self._wrr_length - self._wrr_cursor
+        return positions[index] - self._wrr_cursor
+        
     async def proxy_sse(self, request: Request, backend_name: Optional[str] = None) -> StreamingResponse:
         """Proxy SSE connection with 1:1 passthrough"""
         backend = self.get_healthy_backend(backend_name)
@@ -153,34 +452,74 @@ class MCPRouter:
             )
             
         logger.info(f"Proxying SSE to backend: {backend.name}")
+        # Count the connection as soon as the backend is picked so concurrent
+        # connects see it; released when the response is done
+        backend.active_connections += 1
         
         async def stream_from_backend():
             """Stream data from backend to client"""
+            connected = False
+            session_id = None
+            prelude: Optional[bytes] = b""
+            headers = forward_headers(request)
+            # Ask for an unencoded stream so raw bytes can be forwarded without decoding
+            headers["accept-encoding"] = "identity"
             try:
-                async with httpx.AsyncClient() as client:
-                    async with client.stream(
-                        "GET",
-                        f"{backend.url}/sse",
-                        headers={k: v for k, v in request.headers.items() if k.lower() != 'host'},
-                        timeout=None
-                    ) as response:
-                        
-                        if response.status_code != 200:
-                            async for chunk in self._error_stream("Backend returned error"):
-                                yield chunk
-                            return
-                            
-                        # Stream the response directly
-                        async for chunk in response.aiter_bytes():
+                async with self._client.stream(
+                    "GET",
+                    backend.sse_url,
+                    headers=headers,
+                    timeout=SSE_TIMEOUT
+                ) as response:
+                    
+                    if response.status_code != 200:
+                        backend.on_failure()
+                        async for chunk in self._error_stream("Backend returned error"):
                             yield chunk
+                        return
+                        
+                    connected = True
+                    backend.on_success()
+                    
+                    # Stream the raw response directly; each socket read is already
+                    # one chunk, and no Content-Length is set so the client side
+                    # stays chunked
+                    async for chunk in response.aiter_raw():
+                        if prelude is not None:
+                            # Remember which backend owns the session so message
+                            # POSTs for it are routed back here
+                            prelude += chunk
+                            match = SESSION_ID_PATTERN.search(prelude)
+                            if match:
+                                session_id = match.group(1).decode("ascii", "replace")
+                                self._session_backend[session_id] = backend.name
+                                prelude = None
+                            elif len(prelude) > SESSION_PRELUDE_LIMIT:
+                                prelude = None
+                        yield chunk
                             
             except Exception as e:
-                logger.error(f"Error streaming from backend {backend.name}: {e}")
+                logger.error(f"Error streaming from backend {backend.name}: {type(e).__name__}: {e}")
+                if not connected:
+                    backend.on_failure()
                 async for chunk in self._error_stream("Connection to backend lost"):
                     yield chunk
+            finally:
+                if session_id is not None:
+                    self._session_backend.pop(session_id, None)
                     
-        return StreamingResponse(
-            stream_from_backend(),
+        body = stream_from_backend()
+        
+        async def release():
+            """Close the backend stream and release the connection slot"""
+            try:
+                await body.aclose()
+            finally:
+                backend.active_connections -= 1
+                
+        return ProxyStreamingResponse(
+            body,
+            release,
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -191,66 +530,120 @@ class MCPRouter:
             
     async def proxy_messages(self, request: Request) -> Response:
         """Proxy POST messages with 1:1 passthrough"""
-        # Get session_id to determine backend (for now, just use any healthy backend)
-        backend = self.get_healthy_backend()
+        # Route to the backend that owns the SSE session
+        session_id = request.query_params.get("session_id")
+        owner = self._session_backend.get(session_id) if session_id else None
+        if owner is not None:
+            # No other backend can serve a known session, so never reroute it
+            backend = self.backends.get(owner)
+            if not backend or backend.status is not HEALTHY or not backend.allow_request():
+                return ORJSONResponse(
+                    {"error": f"Backend {owner} owning this session is unavailable"},
+                    status_code=503
+                )
+        else:
+            # Unknown session - hash it so retries keep landing on the same backend
+            backend = self.get_healthy_backend(key=session_id)
         if not backend:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "No healthy backends available"},
                 status_code=404
             )
             
+        backend.active_connections += 1
         try:
-            # Get the raw body
-            body = await request.body()
-            
-            async with httpx.AsyncClient() as client:
-                # Forward the exact request to the backend
-                response = await client.post(
-                    f"{backend.url}/messages/",
-                    params=dict(request.query_params),
-                    headers={k: v for k, v in request.headers.items() if k.lower() != 'host'},
-                    content=body
-                )
+            # Stream the request body straight through to the backend
+            upstream = self._client.build_request(
+                "POST",
+                backend.messages_url,
+                params=dict(request.query_params),
+                headers=forward_headers(request),
+                content=request.stream(),
+                timeout=MESSAGE_TIMEOUT
+            )
+            try:
+                response = await self._client.send(upstream, stream=True)
+            except Exception:
+                backend.on_failure()
+                raise
                 
-                # Return the exact response
-                return Response(
-                    content=response.content,
-                    status_code=response.status_code,
-                    headers={k: v for k, v in dict(response.headers).items() 
-                            if k.lower() not in ['content-length', 'transfer-encoding']}
-                )
-            
         except Exception as e:
-            logger.error(f"Failed to proxy message to backend {backend.name}: {e}")
-            return JSONResponse(
+            backend.active_connections -= 1
+            logger.error(f"Failed to proxy message to backend {backend.name}: {type(e).__name__}: {e}")
+            return ORJSONResponse(
                 {"error": "Failed to connect to backend"},
                 status_code=502
             )
             
+        if response.status_code >= 500:
+            backend.on_failure()
+        else:
+            backend.on_success()
+            
+        async def release():
+            """Close the upstream response and release the connection slot"""
+            try:
+                await response.aclose()
+            finally:
+                backend.active_connections -= 1
+                
+        # Return the exact response, passing the raw header pairs straight through
+        proxied = ProxyStreamingResponse(
+            response.aiter_raw(), release, status_code=response.status_code
+        )
+        proxied.raw_headers.extend(
+            (k.lower(), v) for k, v in response.headers.raw
+            if k.lower() not in _RESP_SKIP
+        )
+        return proxied
+        
     async def _error_stream(self, message: str):
         """Generate error stream in SSE format"""
         yield f"event: error\ndata: {message}\n\n".encode()
         
     async def get_status(self) -> Dict[str, Any]:
         """Get router status"""
-        return {
-            "router": "healthy",
-            "backends": {
-                name: {
-                    "url": backend.url,
-                    "status": backend.status.value,
-                    "last_check": backend.last_check.isoformat() if backend.last_check else None,
-                    "last_healthy": backend.last_healthy.isoformat() if backend.last_healthy else None,
-                    "consecutive_failures": backend.consecutive_failures
+        if self._status_dirty:
+            for backend in self.backends.values():
+                # Format timestamps only once per change
+                if backend.last_check_iso is None and backend.last_check is not None:
+                    backend.last_check_iso = monotonic_isoformat(backend.last_check)
+                if backend.last_healthy_iso is None and backend.last_healthy is not None:
+                    backend.last_healthy_iso = monotonic_isoformat(backend.last_healthy)
+                    
+            self._status_snapshot = {
+                "router": "healthy",
+                "backends": {
+                    name: {
+                        "url": backend.url,
+                        "status": backend.status,
+                        "last_check": backend.last_check_iso,
+                        "last_healthy": backend.last_healthy_iso,
+                        "consecutive_failures": backend.consecutive_failures,
+                        "weight": backend.weight
+                    }
+                    for name, backend in self.backends.items()
                 }
-                for name, backend in self.backends.items()
             }
-        }
+            self._status_dirty = False
+            
+        # Circuit state and connection counts change per request, so refresh
+        # just those fields in place rather than marking the snapshot dirty
+        backends = self._status_snapshot["backends"]
+        for name, backend in self.backends.items():
+            info = backends[name]
+            info["circuit"] = backend.state
+            info["active_connections"] = backend.active_connections
+        return self._status_snapshot
 
 
 # Global router instance
 router = MCPRouter()
 
+# Backends given on the command line, as (name, url) pairs; added once the
+# server's event loop is running
+startup_backends: List[Tuple[str, str]] = []
+
 
 async def handle_sse(request: Request):
     """Handle SSE connections"""
@@ -266,25 +659,43 @@ async def handle_messages(request: Request):
 async def handle_status(request: Request):
     """Handle status endpoint"""
     status = await router.get_status()
-    return JSONResponse(status)
+    return ORJSONResponse(status)
 
 
 async def handle_backends(request: Request):
     """Handle backend management"""
     if request.method == "POST":
         data = await request.json()
-        await router.add_backend(data["name"], data["url"])
-        return JSONResponse({"status": "added"})
+        name = data.get("name") if isinstance(data, dict) else None
+        url = data.get("url") if isinstance(data, dict) else None
+        # Names become JSON object keys in /status and /backends, which orjson
+        # only accepts as str
+        if not isinstance(name, str) or not name or not isinstance(url, str):
+            return ORJSONResponse(
+                {"error": "Backend name and url must be non-empty strings"},
+                status_code=400
+            )
+        try:
+            await router.add_backend(name, url, data.get("weight", 1))
+        except ValueError as e:
+            return ORJSONResponse({"error": str(e)}, status_code=400)
+        return ORJSONResponse({"status": "added"})
     elif request.method == "DELETE":
         name = request.query_params.get("name")
         await router.remove_backend(name)
-        return JSONResponse({"status": "removed"})
+        return ORJSONResponse({"status": "removed"})
     else:
-        return JSONResponse(
+        return ORJSONResponse(
             {name: backend.url for name, backend in router.backends.items()}
         )
 
 
+async def startup_add_backends():
+    """Add the command line backends inside the server's event loop"""
+    for name, url in startup_backends:
+        await router.add_backend(name, url)
+
+
 # Create Starlette app
 app = Starlette(
     debug=True,
@@ -294,7 +705,7 @@ app = Starlette(
         Route("/status", endpoint=handle_status),
         Route("/backends", endpoint=handle_backends, methods=["GET", "POST", "DELETE"]),
     ],
-    on_startup=[router.start],
+    on_startup=[router.start, startup_add_backends],
     on_shutdown=[router.stop]
 )
 
@@ -306,15 +717,20 @@ app = Starlette(
 def main(port: int, health_interval: int, backend: tuple):
     """MCP Router Final - Working transparent proxy"""
     
-    # Add backends from command line
-    async def setup_backends():
-        for b in backend:
-            if "=" in b:
-                name, url = b.split("=", 1)
-                await router.add_backend(name, url)
-                
-    # Run setup before starting server
-    asyncio.run(setup_backends())
+    # Backends from command line are validated here and added on startup, in
+    # uvicorn's event loop, so a bad value never fails inside the lifespan
+    for b in backend:
+        name, _, url = b.partition("=")
+        if not name or not url:
+            raise click.BadParameter(f"expected name=url, got {b!r}", param_hint="'--backend'")
+        if "://" not in url:
+            url = f"http://{url}"
+        if not url.startswith(('http://', 'https://')):
+            raise click.BadParameter(
+                f"backend URL must start with http:// or https://, got {url!r}",
+                param_hint="'--backend'"
+            )
+        startup_backends.append((name, url))
     
     # Update health check interval
     router.health_check_interval = health_interval
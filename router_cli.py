@@ -16,76 +16,96 @@ class RouterCLI:
     
     def __init__(self, router_url: str = "http://localhost:8090"):
         self.router_url = router_url.rstrip('/')
+        self._client: Optional[httpx.AsyncClient] = None
+        
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client shared by all requests to the router, created on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.router_url)
+        return self._client
+        
+    async def __aenter__(self) -> "RouterCLI":
+        """Start a session; the shared client is created on the first request"""
+        return self
+        
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def get_status(self):
         """Get and display router status"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.router_url}/status")
-                if response.status_code == 200:
-                    status = response.json()
-                    print(f"Router Status: {status['router']}")
-                    print(f"Total Sessions: {status.get('total_sessions', 0)}")
-                    print("\nBackends:")
+            response = await self.client.get("/status")
+            if response.status_code == 200:
+                status = response.json()
+                print(f"Router Status: {status['router']}")
+                print(f"Total Sessions: {status.get('total_sessions', 0)}")
+                print("\nBackends:")
+                
+                if not status.get("backends"):
+                    print("  No backends configured")
+                    return
                     
-                    if not status.get("backends"):
-                        print("  No backends configured")
-                        return
-                        
-                    for name, info in status["backends"].items():
-                        status_emoji = "✓" if info["status"] == "healthy" else "✗"
-                        print(f"  {status_emoji} {name}: {info['url']} ({info['status']})")
-                        if info.get("consecutive_failures", 0) > 0:
-                            print(f"    Failures: {info['consecutive_failures']}")
-                else:
-                    print(f"Error: HTTP {response.status_code}")
+                for name, info in status["backends"].items():
+                    status_emoji = "✓" if info["status"] == "healthy" else "✗"
+                    print(f"  {status_emoji} {name}: {info['url']} ({info['status']})")
+                    if info.get("consecutive_failures", 0) > 0:
+                        print(f"    Failures: {info['consecutive_failures']}")
+            else:
+                print(f"Error: HTTP {response.status_code}")
         except Exception as e:
             print(f"Error connecting to router: {e}")
             
     async def add_backend(self, name: str, url: str):
         """Add a new backend"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.router_url}/backends",
-                    json={"name": name, "url": url}
-                )
-                if response.status_code == 200:
-                    print(f"✓ Added backend '{name}' at {url}")
-                else:
-                    print(f"✗ Failed to add backend: HTTP {response.status_code}")
+            response = await self.client.post(
+                "/backends",
+                json={"name": name, "url": url}
+            )
+            if response.status_code == 200:
+                print(f"✓ Added backend '{name}' at {url}")
+            else:
+                print(f"✗ Failed to add backend: HTTP {response.status_code}")
         except Exception as e:
             print(f"✗ Error adding backend: {e}")
             
     async def remove_backend(self, name: str):
         """Remove a backend"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.router_url}/backends",
-                    params={"name": name}
-                )
-                if response.status_code == 200:
-                    print(f"✓ Removed backend '{name}'")
-                else:
-                    print(f"✗ Failed to remove backend: HTTP {response.status_code}")
+            response = await self.client.delete(
+                "/backends",
+                params={"name": name}
+            )
+            if response.status_code == 200:
+                print(f"✓ Removed backend '{name}'")
+            else:
+                print(f"✗ Failed to remove backend: HTTP {response.status_code}")
         except Exception as e:
             print(f"✗ Error removing backend: {e}")
             
     async def list_backends(self):
         """List all backends in JSON format"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.router_url}/backends")
-                if response.status_code == 200:
-                    backends = response.json()
-                    print(json.dumps(backends, indent=2))
-                else:
-                    print(f"Error: HTTP {response.status_code}")
+            response = await self.client.get("/backends")
+            if response.status_code == 200:
+                backends = response.json()
+                print(json.dumps(backends, indent=2))
+            else:
+                print(f"Error: HTTP {response.status_code}")
         except Exception as e:
             print(f"Error: {e}")
 
 
+async def run_command(cli: RouterCLI, command, *args):
+    """Run a RouterCLI command with the shared HTTP client open"""
+    async with cli:
+        await command(*args)
+
+
 @click.group()
 @click.option("--router-url", default="http://localhost:8090", help="Router URL")
 @click.pass_context
@@ -99,7 +119,7 @@ def cli(ctx, router_url: str):
 @click.pass_context
 def status(ctx):
     """Show router and backend status"""
-    asyncio.run(ctx.obj['cli'].get_status())
+    asyncio.run(run_command(ctx.obj['cli'], ctx.obj['cli'].get_status))
 
 
 @cli.command()
@@ -110,7 +130,7 @@ def add(ctx, name: str, url: str):
     """Add a new backend"""
     if not url.startswith(('http://', 'https://')):
         url = f"http://{url}"
-    asyncio.run(ctx.obj['cli'].add_backend(name, url))
+    asyncio.run(run_command(ctx.obj['cli'], ctx.obj['cli'].add_backend, name, url))
 
 
 @cli.command()
@@ -118,14 +138,14 @@ def add(ctx, name: str, url: str):
 @click.pass_context
 def remove(ctx, name: str):
     """Remove a backend"""
-    asyncio.run(ctx.obj['cli'].remove_backend(name))
+    asyncio.run(run_command(ctx.obj['cli'], ctx.obj['cli'].remove_backend, name))
 
 
 @cli.command()
 @click.pass_context
 def list(ctx):
     """List backends in JSON format"""
-    asyncio.run(ctx.obj['cli'].list_backends())
+    asyncio.run(run_command(ctx.obj['cli'], ctx.obj['cli'].list_backends))
 
 
 @cli.command()
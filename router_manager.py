@@ -4,8 +4,10 @@ MCP Router Manager - CLI TUI for managing router backends
 """
 
 import asyncio
+import io
 import json
 import sys
+from contextlib import redirect_stdout
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -13,7 +15,7 @@ import httpx
 import click
 
 
-@dataclass
+@dataclass(slots=True)
 class Backend:
     """Represents a backend server"""
     name: str
@@ -28,22 +30,40 @@ class RouterManager:
     
     def __init__(self, router_url: str = "http://localhost:8090"):
         self.router_url = router_url.rstrip('/')
+        self._client: Optional[httpx.AsyncClient] = None
+        
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client shared by all requests to the router, created on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.router_url)
+        return self._client
+        
+    async def __aenter__(self) -> "RouterManager":
+        """Start a session; the shared client is created on the first request"""
+        return self
+        
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def get_status(self) -> Dict[str, Any]:
         """Get router status"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.router_url}/status")
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise Exception(f"HTTP {response.status_code}")
+            response = await self.client.get("/status")
+            if response.status_code == 200:
+                return response.json()
+            else:
+                raise Exception(f"HTTP {response.status_code}")
         except Exception as e:
             raise Exception(f"Failed to connect to router: {e}")
             
-    async def list_backends(self) -> List[Backend]:
-        """List all backends"""
-        status = await self.get_status()
+    async def list_backends(self, status: Optional[Dict[str, Any]] = None) -> List[Backend]:
+        """List all backends, reusing an already fetched status if given"""
+        if status is None:
+            status = await self.get_status()
         backends = []
         for name, info in status.get("backends", {}).items():
             backends.append(Backend(
@@ -58,24 +78,22 @@ class RouterManager:
     async def add_backend(self, name: str, url: str) -> bool:
         """Add a new backend"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.router_url}/backends",
-                    json={"name": name, "url": url}
-                )
-                return response.status_code == 200
+            response = await self.client.post(
+                "/backends",
+                json={"name": name, "url": url}
+            )
+            return response.status_code == 200
         except Exception:
             return False
             
     async def remove_backend(self, name: str) -> bool:
         """Remove a backend"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.router_url}/backends",
-                    params={"name": name}
-                )
-                return response.status_code == 200
+            response = await self.client.delete(
+                "/backends",
+                params={"name": name}
+            )
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -85,11 +103,34 @@ class TUI:
     
     def __init__(self, manager: RouterManager):
         self.manager = manager
+        self._frame: Optional[List[str]] = None  # lines currently on screen
+        # Backends table layout, reused while backend names and URLs are unchanged
+        self._table_key: Optional[List[tuple]] = None
+        self._table_header: List[str] = []
+        self._row_format = ""
         
     def clear_screen(self):
         """Clear the screen"""
         print("\033[2J\033[H", end="")
         
+    def draw(self, frame: List[str]):
+        """Draw a frame, rewriting only the lines that changed since the last one"""
+        if self._frame is None:
+            self.clear_screen()
+            sys.stdout.write("\n".join(frame))
+        else:
+            parts = ["\033[H"]
+            for i, line in enumerate(frame):
+                if i > 0:
+                    parts.append("\n")
+                if i >= len(self._frame) or self._frame[i] != line:
+                    parts.append(line + "\033[K")
+            # Clear leftovers below the frame (old prompts and input echo)
+            parts.append("\033[J")
+            sys.stdout.write("".join(parts))
+        sys.stdout.flush()
+        self._frame = frame
+        
     def print_header(self):
         """Print header"""
         print("=" * 80)
@@ -103,21 +144,34 @@ class TUI:
             print("No backends configured.")
             return
             
-        # Calculate column widths
-        name_width = max(len(b.name) for b in backends) + 2
-        url_width = max(len(b.url) for b in backends) + 2
-        status_width = 12
-        
-        # Print header
-        print(f"{'Name':<{name_width}} {'URL':<{url_width}} {'Status':<{status_width}} {'Failures'}")
-        print("-" * (name_width + url_width + status_width + 10))
-        
-        # Print backends
+        # Calculate column widths in one pass, only when names or URLs changed
+        table_key = [(b.name, b.url) for b in backends]
+        if table_key != self._table_key:
+            name_width = url_width = 0
+            for name, url in table_key:
+                name_width = max(name_width, len(name))
+                url_width = max(url_width, len(url))
+            name_width += 2
+            url_width += 2
+            status_width = 12
+            
+            self._table_key = table_key
+            self._table_header = [
+                f"{'Name':<{name_width}} {'URL':<{url_width}} {'Status':<{status_width}} {'Failures'}",
+                "-" * (name_width + url_width + status_width + 10)
+            ]
+            self._row_format = f"{{:<{name_width}}} {{:<{url_width}}} {{:<{status_width + 9}}} {{}}"
+            
+        # Build the whole table and write it at once
+        lines = self._table_header[:]
         for backend in backends:
             status_color = self.get_status_color(backend.status)
             status_display = f"{status_color}{backend.status}\033[0m"
             
-            print(f"{backend.name:<{name_width}} {backend.url:<{url_width}} {status_display:<{status_width + 9}} {backend.consecutive_failures}")
+            lines.append(self._row_format.format(
+                backend.name, backend.url, status_display, backend.consecutive_failures
+            ))
+        sys.stdout.write("\n".join(lines) + "\n")
             
     def get_status_color(self, status: str) -> str:
         """Get color code for status"""
@@ -264,50 +318,60 @@ class TUI:
         
     async def run(self):
         """Run the TUI"""
-        while True:
-            try:
-                self.clear_screen()
-                self.print_header()
-                
-                # Get current status
+        # One HTTP client for the whole session instead of one per request
+        async with self.manager:
+            while True:
                 try:
-                    status = await self.manager.get_status()
-                    backends = await self.manager.list_backends()
+                    # Render the frame off-screen, then draw only what changed;
+                    # the frame always ends with a newline so the prompt line is blank
+                    buffer = io.StringIO()
+                    with redirect_stdout(buffer):
+                        self.print_header()
+                        
+                        # Get current status (one request serves both the header and the table)
+                        try:
+                            status = await self.manager.get_status()
+                            backends = await self.manager.list_backends(status)
+                            
+                            print(f"Router Status: \033[92m{status['router']}\033[0m")
+                            print(f"Total Sessions: {status.get('total_sessions', 0)}")
+                            print()
+                            
+                            self.print_backends(backends)
+                            self.print_menu()
+                            
+                        except Exception as e:
+                            print(f"\033[91mError: {e}\033[0m")
+                            print("\nMake sure the MCP router is running on the configured port.")
+                            print()
+                            print("Options:")
+                            print("  [q] Quit")
+                            print()
+                            backends = []
+                            
+                    self.draw(buffer.getvalue().split("\n"))
                     
-                    print(f"Router Status: \033[92m{status['router']}\033[0m")
-                    print(f"Total Sessions: {status.get('total_sessions', 0)}")
-                    print()
+                    choice = self.get_input("Select option").lower()
                     
-                    self.print_backends(backends)
-                    self.print_menu()
-                    
-                except Exception as e:
-                    print(f"\033[91mError: {e}\033[0m")
-                    print("\nMake sure the MCP router is running on the configured port.")
-                    print()
-                    print("Options:")
-                    print("  [q] Quit")
-                    print()
-                    backends = []
-                
-                choice = self.get_input("Select option").lower()
-                
-                if choice == 'q':
+                    if choice == 'q':
+                        break
+                    elif choice == '1':
+                        continue  # Refresh (loop will reload)
+                        
+                    # Anything else writes past the frame, so redraw from scratch next time
+                    self._frame = None
+                    if choice == '2':
+                        await self.add_backend_flow()
+                    elif choice == '3':
+                        await self.remove_backend_flow(backends)
+                    elif choice == '4':
+                        await self.edit_backend_flow(backends)
+                    else:
+                        print("Invalid option!")
+                        input("Press Enter to continue...")
+                        
+                except KeyboardInterrupt:
                     break
-                elif choice == '1':
-                    continue  # Refresh (loop will reload)
-                elif choice == '2':
-                    await self.add_backend_flow()
-                elif choice == '3':
-                    await self.remove_backend_flow(backends)
-                elif choice == '4':
-                    await self.edit_backend_flow(backends)
-                else:
-                    print("Invalid option!")
-                    input("Press Enter to continue...")
-                    
-            except KeyboardInterrupt:
-                break
                 
         print("\nGoodbye!")
 